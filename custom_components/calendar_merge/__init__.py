@@ -5,14 +5,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.generated.entity_platforms import EntityPlatforms
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .calendar_fetcher import CalendarFetcher
 from .calendar_handler import CalendarHandler
 from .const import DOMAIN, LOGGER
-from .hass_util import check_supress_config_update_listener
+from .hass_util import StorageJson, check_supress_config_update_listener
+from .refresh_scheduler import RefreshScheduler
 
 
 # ------------------------------------------------------------------
@@ -25,6 +27,16 @@ class CommonData:
     coordinator: DataUpdateCoordinator
 
 
+# ------------------------------------------------------------------
+# ------------------------------------------------------------------
+@dataclass
+class DomainData:
+    """Data shared by all config entries."""
+
+    fetcher: CalendarFetcher
+    scheduler: RefreshScheduler
+
+
 # The type alias needs to be suffixed with 'ConfigEntry'
 type CommonConfigEntry = ConfigEntry[CommonData]
 
@@ -39,12 +51,19 @@ sensor_platforms: list[EntityPlatforms] = [
 async def async_setup_entry(hass: HomeAssistant, entry: CommonConfigEntry) -> bool:
     """Set up State updates from a config entry."""
 
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = DomainData(CalendarFetcher(hass), RefreshScheduler(hass))
+
+    domain_data: DomainData = hass.data[DOMAIN]
+
     calendar_handler: CalendarHandler = CalendarHandler(
         hass,
         entry,
+        domain_data.fetcher,
     )
 
     await calendar_handler.async_init()
+    await calendar_handler.async_load_snapshot()
 
     coordinator: DataUpdateCoordinator = DataUpdateCoordinator(
         hass,
@@ -55,6 +74,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: CommonConfigEntry) -> bo
 
     entry.runtime_data = CommonData(calendar_handler, coordinator)
 
+    entry.async_on_unload(
+        domain_data.fetcher.subscribe(calendar_handler.calendar_entities)
+    )
+
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, calendar_handler.async_core_config_updated
+        )
+    )
+
     entry.async_on_unload(entry.add_update_listener(config_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, sensor_platforms)
@@ -69,6 +98,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: CommonConfigEntry) -> b
     return await hass.config_entries.async_unload_platforms(entry, sensor_platforms)
 
 
+# ------------------------------------------------------------------
+async def async_remove_entry(hass: HomeAssistant, entry: CommonConfigEntry) -> None:
+    """Remove the stored events of a config entry."""
+
+    await StorageJson(hass, f"{DOMAIN}.{entry.entry_id}").async_remove_settings()
+
+
 # ------------------------------------------------------------------
 async def async_reload_entry(hass: HomeAssistant, entry: CommonConfigEntry) -> None:
     """Reload config entry."""
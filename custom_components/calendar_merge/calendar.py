@@ -11,6 +11,7 @@ from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import CommonConfigEntry
 from .calendar_handler import CalendarHandler
+from .state_write_filter import StateWriteFilter
 
 
 # ------------------------------------------------------
@@ -26,7 +27,7 @@ async def async_setup_entry(
 
 # ------------------------------------------------------
 # ------------------------------------------------------
-class EventsCalendar(CalendarEntity):
+class EventsCalendar(StateWriteFilter, CalendarEntity):
     """Define a events calendar."""
 
     _attr_has_entity_name = True
@@ -86,26 +87,14 @@ class EventsCalendar(CalendarEntity):
     ) -> list[CalendarEvent]:
         """Return calendar events within a datetime range."""
 
-        events: list[CalendarEvent] = []
-
-        for tmp_event in self.calendar_handler.events:
-            check_start: datetime = tmp_event.start_datetime_local
-
-            check_end: datetime = tmp_event.end_datetime_local
-
-            if (
-                start_date <= check_start < end_date
-                or start_date < check_end <= end_date
-                or check_start <= start_date < check_end
-                or check_start < end_date <= check_end
-            ):
-                events.append(tmp_event.as_calender_event())
-        return events
+        return await self.calendar_handler.async_get_calendar_events(
+            start_date, end_date
+        )
 
     # ------------------------------------------------------
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
         )
         self.calendar_handler.entity_id = self.entity_id
@@ -0,0 +1,226 @@
+"""Calendar fetcher shared by all calendar merge helpers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import orjson
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import CALENDAR_FETCH_TTL
+
+type FetchKey = tuple[str, datetime, datetime]
+
+
+# ------------------------------------------------------
+def get_event_key(value: datetime | date | str) -> float:
+    """Get the epoch of an event start or end, all day events at local midnight."""
+
+    if isinstance(value, str):
+        value = (
+            date.fromisoformat(value)
+            if len(value) == 10
+            else datetime.fromisoformat(value)
+        )
+
+    if not isinstance(value, datetime):
+        value = dt_util.start_of_local_day(value)
+
+    return value.timestamp()
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+@dataclass
+class CalendarFetchResult:
+    """Events fetched from a single calendar."""
+
+    events: list[dict]
+    fingerprint: int
+    fetched: datetime
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class CalendarFetcher:
+    """Calendar fetcher.
+
+    Requests for the same calendar and time window are only sent once to the
+    calendar, and the result is shared by all helpers asking for it. The time
+    window is truncated to whole minutes. A result younger than the fetch TTL
+    is also reused for any window it covers, sliced to that window, so helpers
+    with other days ahead or refreshing a bit later share the fetch. Use
+    not_before to skip results fetched before a calendar was changed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Init."""
+
+        self.hass: HomeAssistant = hass
+        self.subscribers: dict[str, int] = {}
+        self.in_flight: dict[
+            FetchKey, tuple[datetime, asyncio.Task[CalendarFetchResult]]
+        ] = {}
+        self.results: dict[FetchKey, CalendarFetchResult] = {}
+
+    # ------------------------------------------------------
+    def subscribe(self, calendar_entities: list[str]) -> Callable[[], None]:
+        """Subscribe to calendars, returns a function to unsubscribe."""
+
+        calendar_entities = list(calendar_entities)
+
+        for calendar_entity in calendar_entities:
+            self.subscribers[calendar_entity] = (
+                self.subscribers.get(calendar_entity, 0) + 1
+            )
+
+        # ------------------------------------------------------
+        @callback
+        def unsubscribe() -> None:
+            for calendar_entity in calendar_entities:
+                self.subscribers[calendar_entity] -= 1
+
+                if self.subscribers[calendar_entity] <= 0:
+                    del self.subscribers[calendar_entity]
+                    self.results = {
+                        key: result
+                        for key, result in self.results.items()
+                        if key[0] != calendar_entity
+                    }
+
+        return unsubscribe
+
+    # ------------------------------------------------------
+    async def async_get_events(
+        self,
+        calendar_entity: str,
+        start_date_time: datetime,
+        end_date_time: datetime,
+        timeout: float,
+        not_before: datetime | None = None,
+        cache_result: bool = True,
+    ) -> CalendarFetchResult:
+        """Get the events of a calendar within a time window.
+
+        Use cache_result=False for one-off windows, the fetch is still shared
+        while in flight, but the result is not kept.
+        """
+
+        key: FetchKey = (
+            calendar_entity,
+            start_date_time.replace(second=0, microsecond=0),
+            end_date_time.replace(second=0, microsecond=0),
+        )
+
+        if (result := self.get_covering_result(key, not_before)) is not None:
+            return result
+
+        started, task = self.in_flight.get(key, (None, None))
+
+        if task is None or (not_before is not None and started < not_before):
+            task = self.hass.async_create_task(
+                self.async_fetch(key, timeout, cache_result)
+            )
+            # The exception is handled by the waiters, if any are left
+            task.add_done_callback(lambda x: x.cancelled() or x.exception())
+            self.in_flight[key] = (dt_util.utcnow(), task)
+
+        async with asyncio.timeout(timeout):
+            return await asyncio.shield(task)
+
+    # ------------------------------------------------------
+    async def async_fetch(
+        self, key: FetchKey, timeout: float, cache_result: bool = True
+    ) -> CalendarFetchResult:
+        """Fetch the events of a calendar."""
+
+        calendar_entity, start_date_time, end_date_time = key
+        fetched: datetime = dt_util.utcnow()
+
+        try:
+            async with asyncio.timeout(timeout):
+                tmp_events: dict = await self.hass.services.async_call(
+                    "calendar",
+                    "get_events",
+                    service_data={
+                        ATTR_ENTITY_ID: calendar_entity,
+                        "end_date_time": end_date_time.isoformat(),
+                        "start_date_time": start_date_time.isoformat(),
+                    },
+                    blocking=True,
+                    return_response=True,
+                )
+        finally:
+            if self.in_flight.get(key, (None, None))[1] is asyncio.current_task():
+                del self.in_flight[key]
+
+        events: list[dict] = tmp_events.get(calendar_entity, {}).get("events", [])
+        result = CalendarFetchResult(events, hash(orjson.dumps(events)), fetched)
+
+        if not cache_result:
+            return result
+
+        self.results = {
+            tmp_key: tmp_result
+            for tmp_key, tmp_result in self.results.items()
+            if fetched - tmp_result.fetched <= CALENDAR_FETCH_TTL
+        }
+        self.results[key] = result
+
+        return result
+
+    # ------------------------------------------------------
+    def get_covering_result(
+        self, key: FetchKey, not_before: datetime | None = None
+    ) -> CalendarFetchResult | None:
+        """Get the latest result younger than the TTL covering the window of key.
+
+        A result for a wider window is sliced to the window, and the slice is
+        kept for the window.
+        """
+
+        calendar_entity, start_date_time, end_date_time = key
+        min_fetched: datetime = dt_util.utcnow() - CALENDAR_FETCH_TTL
+
+        if not_before is not None:
+            min_fetched = max(min_fetched, not_before)
+
+        tmp_key, result = max(
+            (
+                (tmp_key, tmp_result)
+                for tmp_key, tmp_result in self.results.items()
+                if tmp_key[0] == calendar_entity
+                and tmp_key[1] <= start_date_time
+                and end_date_time <= tmp_key[2]
+                and tmp_result.fetched >= min_fetched
+            ),
+            key=lambda x: x[1].fetched,
+            default=(None, None),
+        )
+
+        if result is None or tmp_key == key:
+            return result
+
+        start_key: float = start_date_time.timestamp()
+        end_key: float = end_date_time.timestamp()
+        events: list[dict] = []
+
+        for event in result.events:
+            event_start: float = get_event_key(event["start"])
+
+            if event_start < end_key and (
+                event_start >= start_key or get_event_key(event["end"]) > start_key
+            ):
+                events.append(event)
+
+        self.results[key] = CalendarFetchResult(
+            events, hash(orjson.dumps(events)), result.fetched
+        )
+
+        return self.results[key]
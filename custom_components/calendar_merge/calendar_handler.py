@@ -2,37 +2,48 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from collections import OrderedDict
+from collections.abc import Collection
+from dataclasses import dataclass, field
 from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+import heapq
+from itertools import islice
+import logging
+import math
 from typing import Any
+import zlib
 
-from arrow.locales import get_locale
-from babel.dates import (
-    format_date as babel_format_date,
-    format_datetime as babel_format_datetime,
-    format_time as babel_format_time,
-    format_timedelta as babel_format_timedelta,
-    get_datetime_format as babel_get_datetime_format,
-)
+from babel.dates import TIMEDELTA_UNITS
 
 from homeassistant.components.calendar import CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import Event, HomeAssistant, State
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import entity_registry as er, issue_registry as ir
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_util
 
+from . import event_format
+from .calendar_fetcher import CalendarFetcher, CalendarFetchResult
 from .const import (
+    CALENDAR_CACHE_TTL,
+    CALENDAR_RANGE_CACHE_SIZE,
+    CALENDAR_TIMEOUT_DEFAULT,
     CONF_CALENDAR_ENTITY_IDS,
+    CONF_CALENDAR_TIMEOUT,
+    CONF_COMPACT_EVENTS_ATTRIBUTE,
     CONF_DAYS_AHEAD,
     CONF_EVENT_TEMPLATE,
     CONF_EVENT_TEMPLATE_DEFAULT,
+    CONF_EVENTS_DESCRIPTION_MAX_LENGTH,
     CONF_FORMAT_DATE,
     CONF_MAX_EVENTS,
     CONF_MD_HEADER_TEMPLATE,
     CONF_MD_ITEM_TEMPLATE,
+    CONF_REFRESH_ON_CALENDAR_CHANGE,
     CONF_REMOVE_RECURRING_EVENTS,
     CONF_SHOW_EVENT_AS_TIME_TO,
     DOMAIN,
@@ -41,12 +52,117 @@ from .const import (
     TRANSLATION_KEY_MISSING_CALENDER,
     TRANSLATION_KEY_TEMPLATE_ERROR,
 )
+from .event_index import EventIndex
+from .fast_template import FastTemplate, get_template_variables, is_static_template
 from .hass_util import (
+    StorageJson,
     async_get_user_language,
     async_hass_add_executor_job,
     set_supress_config_update_listener,
 )
 
+type RangeKey = tuple[int, int, int]
+
+SNAPSHOT_EVENT_FIELDS: tuple[str, ...] = (
+    "calendar",
+    "start",
+    "end",
+    "summary",
+    "description",
+    "location",
+)
+SNAPSHOT_FORMATTED_FIELDS: tuple[str, ...] = (
+    "formatted_start",
+    "formatted_start_date",
+    "formatted_start_time",
+    "formatted_end",
+    "formatted_end_date",
+    "formatted_end_time",
+    "formatted_time_to",
+    "formatted_event_time",
+    "formatted_event",
+)
+EVENT_TEMPLATE_VARIABLES: tuple[str, ...] = (
+    *SNAPSHOT_EVENT_FIELDS,
+    "all_day",
+    *SNAPSHOT_FORMATTED_FIELDS[:-1],
+)
+MD_ITEM_TEMPLATE_VARIABLES: tuple[str, ...] = (
+    *SNAPSHOT_EVENT_FIELDS,
+    "all_day",
+    *SNAPSHOT_FORMATTED_FIELDS,
+)
+
+MARKDOWN_ESCAPE_TABLE: dict[int, str] = str.maketrans(
+    {char: "\\" + char for char in "\\_*[]()~`>#+-=|{}.!"}
+)
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=4096)
+def escape_markdown(txt: str) -> str:
+    """Escape the markdown special characters of a value.
+
+    <br> in the value is kept as a line break.
+    """
+
+    return txt.replace("<br>", "\r").translate(MARKDOWN_ESCAPE_TABLE)
+
+
+# ------------------------------------------------------
+def get_next_timedelta_change(seconds: float, threshold: float = 0.85) -> float:
+    """Get seconds until the babel formatted timedelta changes.
+
+    seconds is the time until the event starts, negative when it has started.
+    The babel units are rounded to the nearest integer, and the unit changes
+    when the value drops below threshold. Changes within the last minute are
+    not tracked, instead the event start is used.
+    """
+
+    units: list[tuple[str, int]] = [
+        (unit, secs) for unit, secs in TIMEDELTA_UNITS if unit != "second"
+    ]
+    abs_seconds: float = abs(seconds)
+
+    unit_index: int | None = next(
+        (
+            index
+            for index, (_, secs) in enumerate(units)
+            if abs_seconds / secs >= threshold
+        ),
+        None,
+    )
+
+    if seconds > 0:
+        if unit_index is None:
+            return seconds
+
+        secs = units[unit_index][1]
+        value: int = max(1, round(abs_seconds / secs))
+        candidates: list[float] = [threshold * secs]
+
+        if value >= 2:
+            candidates.append((value - 0.5) * secs)
+
+        return abs_seconds - max(
+            (x for x in candidates if x < abs_seconds), default=abs_seconds
+        )
+
+    if unit_index is None:
+        return threshold * units[-1][1] - abs_seconds
+
+    secs = units[unit_index][1]
+    value = max(1, round(abs_seconds / secs))
+    candidates = [(value + 0.5) * secs]
+
+    if unit_index > 0:
+        candidates.append(threshold * units[unit_index - 1][1])
+
+    return (
+        min((x for x in candidates if x > abs_seconds), default=abs_seconds)
+        - abs_seconds
+    )
+
 
 # ------------------------------------------------------
 # ------------------------------------------------------
@@ -142,16 +258,77 @@ class CalendarMergeEvent(CalendarEvent):
         self.formatted_time_to: str = ""
         self.formatted_event_time: str = ""
         self.formatted_event: str = ""
+        self.calendar_event: CalendarEvent | None = None
 
         super().__post_init__()
 
+        # Epoch keys used for sorting, deduplication and range queries.
+        # All day events start and end at local midnight.
+        self.start_key: int = int(self.start_datetime_local.timestamp())
+        self.end_key: int = int(self.end_datetime_local.timestamp())
+
     # ------------------------------------------------------
-    def as_calender_event(self) -> CalendarEvent:
-        """As calendar event parms."""
-        return CalendarEvent(
-            self.start, self.end, self.summary, self.description, self.location
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, Any]) -> CalendarMergeEvent:
+        """Create event from snapshot."""
+
+        event: CalendarMergeEvent = cls(
+            snapshot["calendar"],
+            snapshot["start"],
+            snapshot["end"],
+            snapshot["summary"],
+            snapshot["description"],
+            snapshot["location"],
+        )
+
+        for key in SNAPSHOT_FORMATTED_FIELDS:
+            setattr(event, key, snapshot.get(key, ""))
+
+        return event
+
+    # ------------------------------------------------------
+    def as_snapshot(self) -> dict[str, Any]:
+        """As snapshot."""
+
+        return {
+            "calendar": self.calendar,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "summary": self.summary,
+            "description": self.description,
+            "location": self.location,
+            **{key: getattr(self, key) for key in SNAPSHOT_FORMATTED_FIELDS},
+        }
+
+    # ------------------------------------------------------
+    def fingerprint(self) -> tuple[Any, ...]:
+        """Fingerprint of the event and its formatted fields."""
+
+        return (
+            self.calendar,
+            self.start,
+            self.end,
+            self.summary,
+            self.description,
+            self.location,
+            *(getattr(self, key) for key in SNAPSHOT_FORMATTED_FIELDS),
         )
 
+    # ------------------------------------------------------
+    def as_calender_event(self) -> CalendarEvent:
+        """As calendar event parms.
+
+        The calendar event is created once and reused, the event is not changed
+        after it is parsed.
+        """
+
+        if self.calendar_event is None:
+            self.calendar_event = CalendarEvent(
+                self.start, self.end, self.summary, self.description, self.location
+            )
+
+        return self.calendar_event
+
     # ------------------------------------------------------
     def __eq__(self, other: CalendarMergeEvent) -> bool:
         """Eq."""
@@ -166,6 +343,25 @@ class CalendarMergeEvent(CalendarEvent):
         )
 
 
+# ------------------------------------------------------
+def event_sort_key(event: CalendarMergeEvent) -> int:
+    """Sort key for events."""
+    return event.start_key
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+@dataclass
+class CalendarCache:
+    """Cached events of a single calendar."""
+
+    fingerprint: int
+    fetched: datetime
+    parsed: list[CalendarMergeEvent]
+    events: list[CalendarMergeEvent] = field(default_factory=list)
+    valid_until: int | None = None
+
+
 # ------------------------------------------------------
 # ------------------------------------------------------
 class CalendarHandler:
@@ -175,12 +371,23 @@ class CalendarHandler:
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
+        fetcher: CalendarFetcher,
     ) -> None:
         """Init."""
 
         self.hass: HomeAssistant = hass
         self.entry: ConfigEntry = entry
+        self.fetcher: CalendarFetcher = fetcher
         self.events: list[CalendarMergeEvent] = []
+        self.composed_events: list[list[CalendarMergeEvent]] | None = None
+        self.horizon: tuple[float, float] | None = None
+        self.options_version: int = self.get_options_version()
+        self.range_cache: OrderedDict[RangeKey, tuple[datetime, EventIndex]] = (
+            OrderedDict()
+        )
+        self.range_in_flight: dict[RangeKey, asyncio.Task[EventIndex]] = {}
+        self.event_index: EventIndex | None = None
+        self.calendar_cache: dict[str, CalendarCache] = {}
 
         self.entity_id: str = ""
         registry = er.async_get(hass)
@@ -193,9 +400,22 @@ class CalendarHandler:
         self.show_event_as_time_to: bool = entry.options.get(
             CONF_SHOW_EVENT_AS_TIME_TO, False
         )
+        self.refresh_on_calendar_change: bool = entry.options.get(
+            CONF_REFRESH_ON_CALENDAR_CHANGE, False
+        )
 
         self.suppress_update_listener = False
 
+        self.markdown_text: str = ""
+        self.templates: dict[str, tuple[str, Template | FastTemplate | None]] = {}
+        self.markdown_header: tuple[Template | FastTemplate | None, str] = (None, "")
+        self.markdown_fragments: dict[tuple[Any, ...], str] = {}
+        self.events_attributes_events: list[CalendarMergeEvent] | None = None
+        self.events_attributes: dict[str, Any] = {}
+        self.events_attributes_json: bytes = b""
+        self.snapshot: StorageJson = StorageJson(hass, f"{DOMAIN}.{entry.entry_id}")
+        self.snapshot_key: list[Any] = []
+
     # ------------------------------------------------------
     async def async_init(
         self,
@@ -203,6 +423,124 @@ class CalendarHandler:
         """Async init."""
         self.language = await async_get_user_language()
 
+        await self.async_init_formatter()
+
+    # ------------------------------------------------------
+    async def async_init_formatter(self) -> None:
+        """Resolve the babel locale and patterns once, used for all formatting."""
+
+        date_format: str = self.entry.options.get(CONF_FORMAT_DATE, "medium")
+
+        self.formatter = await self.hass.async_add_executor_job(
+            event_format.get_event_formatter, date_format, self.language
+        )
+
+    # ------------------------------------------------------
+    async def async_core_config_updated(self, _event: Event) -> None:
+        """Resolve the formatter again and refresh, when the language changed."""
+
+        language: str = await async_get_user_language()
+
+        if language == self.language:
+            return
+
+        self.language = language
+        await self.async_init_formatter()
+        self.hass.data[DOMAIN].scheduler.request_refresh(self.entry.entry_id)
+
+    # ------------------------------------------------------
+    async def async_load_snapshot(self) -> None:
+        """Load the last merged events, used until the first refresh.
+
+        Events which have ended since the snapshot are dropped. When the options
+        or language have changed or events were dropped, only the event fields
+        are kept, and the events and markdown are formatted again.
+        """
+
+        data: dict | None = await self.snapshot.async_read_settings()
+
+        if data is None:
+            return
+
+        try:
+            snapshot_events: list[CalendarMergeEvent] = [
+                CalendarMergeEvent.from_snapshot(event) for event in data["events"]
+            ]
+            markdown_text: str = data["markdown_text"]
+            self.snapshot_key = self.get_snapshot_key(
+                data["events"], data.get("options_version"), data.get("language")
+            )
+
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.warning("Unable to load last known events: %s", err)
+            return
+
+        now_key: int = int(dt_util.now().timestamp())
+        self.events = [event for event in snapshot_events if event.end_key > now_key]
+
+        if (
+            data.get("options_version") == self.options_version
+            and data.get("language") == self.language
+            and len(self.events) == len(snapshot_events)
+        ):
+            self.markdown_text = markdown_text
+            return
+
+        await self.async_format_events(self.events)
+        self.create_markdown()
+
+    # ------------------------------------------------------
+    def get_snapshot_key(
+        self,
+        snapshot_events: list[dict[str, Any]],
+        options_version: int | None,
+        language: str | None,
+    ) -> list[Any]:
+        """Get the options version, language and raw event fields of a snapshot.
+
+        Used to detect changes, the options version covers changed templates.
+        """
+
+        return [
+            options_version,
+            language,
+            *(
+                [event.get(key) for key in SNAPSHOT_EVENT_FIELDS]
+                for event in snapshot_events
+            ),
+        ]
+
+    # ------------------------------------------------------
+    def get_options_version(self) -> int:
+        """Get a version of the current options, stable across restarts."""
+
+        return zlib.crc32(json_bytes(dict(sorted(self.entry.options.items()))))
+
+    # ------------------------------------------------------
+    async def async_save_snapshot(self) -> None:
+        """Save the merged events when the events, options or language changed."""
+
+        snapshot_events: list[dict[str, Any]] = [
+            event.as_snapshot() for event in self.events
+        ]
+        options_version: int = self.get_options_version()
+        snapshot_key: list[Any] = self.get_snapshot_key(
+            snapshot_events, options_version, self.language
+        )
+
+        if snapshot_key == self.snapshot_key:
+            return
+
+        self.snapshot_key = snapshot_key
+        await self.snapshot.async_write_settings(
+            {
+                "events": snapshot_events,
+                "markdown_text": self.markdown_text,
+                "options_version": options_version,
+                "language": self.language,
+            }
+        )
+
     # ------------------------------------------------------------------
     @set_supress_config_update_listener()
     def update_settings(self, entry_options: dict[str, Any]) -> None:
@@ -214,129 +552,465 @@ class CalendarHandler:
         )
 
     # ------------------------------------------------------
-    async def async_merge_calendar_events(
+    async def async_update_calendars(
+        self,
+        calendar_entities: list[str] | None = None,
+        not_before: datetime | None = None,
+    ) -> None:
+        """Fetch the calendars and update their cached events.
+
+        Only the calendars in calendar_entities are fetched, the events of the
+        other calendars are reused from the last fetch. Use not_before when a
+        calendar has changed, so a shared fetch from before the change is not
+        reused. The calendars are fetched concurrently, and a calendar that
+        fails or times out keeps its last known events. Use compose_events to
+        merge the cached events.
+        """
+
+        if calendar_entities is None:
+            calendar_entities = self.calendar_entities
+
+        calendar_entities = [
+            calendar_entity
+            for calendar_entity in calendar_entities
+            if calendar_entity in self.calendar_entities
+        ]
+
+        if len(calendar_entities) > 0:
+            start_date_time: datetime = dt_util.now()
+            end_date_time: datetime = start_date_time + timedelta(
+                days=self.entry.options.get(CONF_DAYS_AHEAD, 30)
+            )
+
+            results: list[CalendarFetchResult | BaseException] = await asyncio.gather(
+                *[
+                    self.async_fetch_calendar_events(
+                        calendar_entity, start_date_time, end_date_time, not_before
+                    )
+                    for calendar_entity in calendar_entities
+                ],
+                return_exceptions=True,
+            )
+
+            for calendar_entity, result in zip(
+                calendar_entities, results, strict=True
+            ):
+                if isinstance(result, TimeoutError):
+                    LOGGER.warning(
+                        "Timeout fetching events from %s, using last known events",
+                        calendar_entity,
+                    )
+                    continue
+
+                if isinstance(result, BaseException):
+                    LOGGER.error("%s: %s", calendar_entity, result)
+                    continue
+
+                self.update_calendar_cache(calendar_entity, result, start_date_time)
+
+    # ------------------------------------------------------
+    def update_calendar_cache(
         self,
+        calendar_entity: str,
+        result: CalendarFetchResult,
+        fetched: datetime,
     ) -> None:
-        """Merge calendar events."""
+        """Update the cached events of a calendar.
+
+        The events are only parsed again when the fingerprint of the fetched
+        events has changed.
+        """
+
+        cache: CalendarCache | None = self.calendar_cache.get(calendar_entity)
+
+        if cache is not None and cache.fingerprint == result.fingerprint:
+            cache.fetched = fetched
+            return
 
-        self.events = []
+        # The calendar has changed, so cached ranges may be outdated
+        self.range_cache.clear()
+
+        cache = CalendarCache(
+            result.fingerprint,
+            fetched,
+            self.parse_calendar_events(calendar_entity, result.events),
+        )
+        self.prune_calendar_cache(cache, fetched)
+        self.calendar_cache[calendar_entity] = cache
+
+    # ------------------------------------------------------
+    def parse_calendar_events(
+        self, calendar_entity: str, events: list[dict]
+    ) -> list[CalendarMergeEvent]:
+        """Parse the events fetched from a calendar."""
 
         def fix_calendar_name(key: Any) -> str:
             return str(key).replace("calendar.", "").replace("_", " ").capitalize()
 
-        try:
-            tmp_events: dict = await self.hass.services.async_call(
-                "calendar",
-                "get_events",
-                service_data={
-                    ATTR_ENTITY_ID: self.calendar_entities,
-                    "end_date_time": (
-                        dt_util.now()
-                        + timedelta(days=self.entry.options.get(CONF_DAYS_AHEAD, 30))
-                    ).isoformat(),
-                    "start_date_time": dt_util.now().isoformat(),
-                },
-                blocking=True,
-                return_response=True,
+        calendar: str = fix_calendar_name(calendar_entity)
+
+        return [
+            CalendarMergeEvent(
+                calendar,
+                event["start"],
+                event["end"],
+                event.get("summary", ""),
+                event.get("description", ""),
+                event.get("location", ""),
             )
-        # except (ServiceValidationError, ServiceNotFound, vol.Invalid) as err:
-        except Exception as err:  # noqa: BLE001
-            LOGGER.error(err)
-            return
+            for event in events
+        ]
 
-        for calendar_name in tmp_events:
-            for event in tmp_events[calendar_name]["events"]:
-                self.events.append(
-                    CalendarMergeEvent(
-                        fix_calendar_name(calendar_name),
-                        event["start"],
-                        event["end"],
-                        event.get("summary", ""),
-                        event.get("description", ""),
-                        event.get("location", ""),
-                    )
-                )
+    # ------------------------------------------------------
+    def prune_calendar_cache(self, cache: CalendarCache, now: datetime) -> None:
+        """Remove ended events from the cache, deduplicate and sort the rest."""
+
+        now_key: int = int(now.timestamp())
+        cache.parsed = [event for event in cache.parsed if event.end_key > now_key]
 
         if self.entry.options.get(CONF_REMOVE_RECURRING_EVENTS, True):
-            self.remove_recurring_events()
+            cache.events = self.remove_recurring_events(cache.parsed)
+        else:
+            cache.events = list(cache.parsed)
 
-        self.events.sort(key=lambda x: x.start_datetime_local.isoformat())
-        self.events = self.events[: int(self.entry.options.get(CONF_MAX_EVENTS, 5))]
+        cache.events.sort(key=event_sort_key)
+
+        cache.valid_until = min((event.end_key for event in cache.parsed), default=None)
 
     # ------------------------------------------------------
-    def remove_recurring_events(self) -> None:
-        """Remove recurring events."""
+    def compose_events(self) -> None:
+        """Compose the merged events from the cached calendars.
+
+        The cached events of each calendar are sorted, so the first max_events
+        events used by the sensors are taken from a lazy k-way merge. The events
+        are only composed again when the cached events of a calendar changed,
+        and the event index of all events within the horizon, backing the
+        calendar entity, is then built on first use.
+        """
 
-        index: int = 0
+        now: datetime = dt_util.now()
+        calendars_events: list[list[CalendarMergeEvent]] = []
+        fetched: list[datetime] = []
 
-        while index < (len(self.events) - 1):
-            for index2, _ in reversed(list(enumerate(self.events))):
-                if index2 <= index:
-                    break
+        for calendar_entity in self.calendar_entities:
+            cache: CalendarCache | None = self.calendar_cache.get(calendar_entity)
+
+            if cache is None:
+                continue
+
+            if now - cache.fetched > CALENDAR_CACHE_TTL:
+                LOGGER.warning(
+                    "Events from %s are older than %s, dropping them",
+                    calendar_entity,
+                    CALENDAR_CACHE_TTL,
+                )
+                del self.calendar_cache[calendar_entity]
+                continue
+
+            if cache.valid_until is not None and cache.valid_until <= now.timestamp():
+                self.prune_calendar_cache(cache, now)
+
+            calendars_events.append(cache.events)
+            fetched.append(cache.fetched)
+
+        self.horizon = (
+            (
+                now.timestamp(),
+                (
+                    min(fetched)
+                    + timedelta(days=self.entry.options.get(CONF_DAYS_AHEAD, 30))
+                ).timestamp(),
+            )
+            if len(fetched) > 0
+            else None
+        )
 
-                if self.events[index].all_day == self.events[index2].all_day:
-                    if (
-                        isinstance(self.events[index].start, datetime)
-                        and self.events[index].calendar == self.events[index2].calendar
-                        and self.events[index].summary == self.events[index2].summary
-                        and self.events[index].description
-                        == self.events[index2].description
-                        and self.events[index].start.time()
-                        == self.events[index2].start.time()
-                        and self.events[index].end.time()
-                        == self.events[index2].end.time()
-                    ) or (
-                        isinstance(self.events[index].start, date)
-                        and self.events[index].calendar == self.events[index2].calendar
-                        and self.events[index].summary == self.events[index2].summary
-                        and self.events[index].description
-                        == self.events[index2].description
-                    ):
-                        del self.events[index2]
+        if self.composed_events is not None and (
+            len(self.composed_events) == len(calendars_events)
+            and all(
+                composed is events
+                for composed, events in zip(
+                    self.composed_events, calendars_events, strict=True
+                )
+            )
+        ):
+            return
 
-            index += 1
+        self.composed_events = calendars_events
+        self.event_index = None
+        self.events = list(
+            islice(
+                heapq.merge(*calendars_events, key=event_sort_key),
+                int(self.entry.options.get(CONF_MAX_EVENTS, 5)),
+            )
+        )
 
     # ------------------------------------------------------
-    def format_datetime(
+    def get_event_index(self) -> EventIndex:
+        """Get the event index of all merged events within the horizon.
+
+        The index is built on first use after the events were composed.
+        """
+
+        if self.event_index is None:
+            self.event_index = EventIndex(
+                list(heapq.merge(*(self.composed_events or []), key=event_sort_key))
+            )
+
+        return self.event_index
+
+    # ------------------------------------------------------
+    def get_next_boundary(self) -> datetime | None:
+        """Get the next point in time the merged events can change.
+
+        That is the next start or end of an event, or the next time the
+        formatted time to an event changes, if the templates use it.
+        """
+
+        now: float = dt_util.now().timestamp()
+        boundaries: list[float] = []
+        uses_time_to: bool = self.uses_formatted_time_to()
+
+        for event in self.events:
+            boundaries.extend(
+                key for key in (event.start_key, event.end_key) if key > now
+            )
+
+            if not uses_time_to:
+                continue
+
+            diff: float = event.start_key - now
+
+            if not event.all_day or diff > 0:
+                boundaries.append(now + get_next_timedelta_change(diff) + 1)
+
+        if len(boundaries) == 0:
+            return None
+
+        return dt_util.utc_from_timestamp(min(boundaries))
+
+    # ------------------------------------------------------
+    async def async_fetch_calendar_events(
         self,
-        date_time: datetime | date,
-    ) -> str | None:
-        """Format date."""
-        return babel_format_datetime(
-            datetime=date_time,
-            format=self.entry.options.get(CONF_FORMAT_DATE, "medium"),
-            locale=self.language,
+        calendar_entity: str,
+        start_date_time: datetime,
+        end_date_time: datetime,
+        not_before: datetime | None = None,
+        cache_result: bool = True,
+    ) -> CalendarFetchResult:
+        """Fetch the events of a single calendar."""
+
+        return await self.fetcher.async_get_events(
+            calendar_entity,
+            start_date_time,
+            end_date_time,
+            self.entry.options.get(CONF_CALENDAR_TIMEOUT, CALENDAR_TIMEOUT_DEFAULT),
+            not_before,
+            cache_result,
         )
 
     # ------------------------------------------------------
-    @async_hass_add_executor_job()
-    def async_format_datetime_x(
-        self,
-        date_time: datetime | date,
-    ) -> str | None:
-        """Format datetime."""
-        return self.format_datetime(date_time)
+    async def async_get_calendar_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Get the calendar events within a range.
+
+        The part of the range within the horizon of the merged events is taken
+        from the event index, the parts before and after the horizon are fetched
+        from the calendars on demand. Events spanning the start of the horizon
+        are taken from the index, events spanning its end from the fetch. The
+        fetched parts are widened to whole hours, so they are cached across
+        refreshes.
+        """
+
+        start_key: float = start_date.timestamp()
+        end_key: float = end_date.timestamp()
+
+        if (
+            self.horizon is None
+            or end_key <= self.horizon[0]
+            or self.horizon[1] <= start_key
+        ):
+            event_index: EventIndex = await self.async_get_range_index(
+                start_date, end_date
+            )
+            return event_index.get_range(start_key, end_key)
+
+        horizon_start, horizon_end = self.horizon
+        calendar_events: list[CalendarEvent] = []
+
+        if start_key < horizon_start:
+            event_index = await self.async_get_range_index(
+                start_date,
+                dt_util.utc_from_timestamp(math.ceil(horizon_start / 3600) * 3600),
+            )
+            calendar_events.extend(
+                event_index.get_range(
+                    start_key, horizon_start, max_end_key=horizon_start
+                )
+            )
+
+        calendar_events.extend(
+            self.get_event_index().get_range(
+                max(start_key, horizon_start), min(end_key, horizon_end)
+            )
+        )
+
+        if horizon_end < end_key:
+            event_index = await self.async_get_range_index(
+                dt_util.utc_from_timestamp(math.floor(horizon_end / 3600) * 3600),
+                end_date,
+            )
+            calendar_events.extend(
+                event_index.get_range(horizon_end, end_key, min_start_key=horizon_end)
+            )
+
+        return calendar_events
 
     # ------------------------------------------------------
-    def format_date(
-        self,
-        date_time: datetime | date,
-    ) -> str | None:
-        """Format date."""
-        return babel_format_date(
-            date=date_time,
-            format=self.entry.options.get(CONF_FORMAT_DATE, "medium"),
-            locale=self.language,
+    async def async_get_range_index(
+        self, start_date: datetime, end_date: datetime
+    ) -> EventIndex:
+        """Get the event index of a range outside the horizon.
+
+        The indexes are kept in a small LRU cache keyed by range and options,
+        and concurrent requests for the same range share one fetch.
+        """
+
+        key: RangeKey = (
+            int(start_date.timestamp()),
+            int(end_date.timestamp()),
+            self.options_version,
         )
 
+        if (cached := self.range_cache.get(key)) is not None and (
+            dt_util.utcnow() - cached[0] <= CALENDAR_CACHE_TTL
+        ):
+            self.range_cache.move_to_end(key)
+            return cached[1]
+
+        if (task := self.range_in_flight.get(key)) is None:
+            task = self.hass.async_create_task(
+                self.async_fetch_range_index(key, start_date, end_date)
+            )
+            # The exception is handled by the waiters, if any are left
+            task.add_done_callback(lambda x: x.cancelled() or x.exception())
+            self.range_in_flight[key] = task
+
+        return await asyncio.shield(task)
+
     # ------------------------------------------------------
-    @async_hass_add_executor_job()
-    def async_format_date(
+    async def async_fetch_range_index(
+        self, key: RangeKey, start_date: datetime, end_date: datetime
+    ) -> EventIndex:
+        """Fetch a range from all calendars and merge it into an event index."""
+
+        calendar_entities: list[str] = list(self.calendar_entities)
+
+        try:
+            results: list[CalendarFetchResult | BaseException] = await asyncio.gather(
+                *[
+                    self.async_fetch_calendar_events(
+                        calendar_entity, start_date, end_date, cache_result=False
+                    )
+                    for calendar_entity in calendar_entities
+                ],
+                return_exceptions=True,
+            )
+        finally:
+            self.range_in_flight.pop(key, None)
+
+        calendars_events: list[list[CalendarMergeEvent]] = []
+        complete: bool = True
+
+        for calendar_entity, result in zip(calendar_entities, results, strict=True):
+            if isinstance(result, BaseException):
+                LOGGER.warning("%s: %s", calendar_entity, result)
+                complete = False
+                continue
+
+            events: list[CalendarMergeEvent] = self.parse_calendar_events(
+                calendar_entity, result.events
+            )
+
+            if self.entry.options.get(CONF_REMOVE_RECURRING_EVENTS, True):
+                events = self.remove_recurring_events(events)
+
+            events.sort(key=event_sort_key)
+            calendars_events.append(events)
+
+        event_index = EventIndex(
+            list(heapq.merge(*calendars_events, key=event_sort_key))
+        )
+
+        if complete:
+            self.range_cache[key] = (dt_util.utcnow(), event_index)
+
+            while len(self.range_cache) > CALENDAR_RANGE_CACHE_SIZE:
+                self.range_cache.popitem(last=False)
+
+        return event_index
+
+    # ------------------------------------------------------
+    def rename_calendar_entity(self, old_entity_id: str, new_entity_id: str) -> None:
+        """Rename calendar entity."""
+
+        if old_entity_id not in self.calendar_entities:
+            return
+
+        self.calendar_entities[self.calendar_entities.index(old_entity_id)] = (
+            new_entity_id
+        )
+        self.calendar_cache.pop(old_entity_id, None)
+        self.range_cache.clear()
+
+    # ------------------------------------------------------
+    def remove_calendar_entity(self, entity_id: str) -> None:
+        """Remove calendar entity."""
+
+        if entity_id in self.calendar_entities:
+            self.calendar_entities.remove(entity_id)
+
+        self.calendar_cache.pop(entity_id, None)
+        self.range_cache.clear()
+
+    # ------------------------------------------------------
+    def remove_recurring_events(
+        self, events: list[CalendarMergeEvent]
+    ) -> list[CalendarMergeEvent]:
+        """Remove recurring events.
+
+        Only the first occurrence of events with the same calendar, summary,
+        description, start and end time of day is kept. For all day events the
+        number of days is used instead of the time of day.
+        """
+
+        keys: set[tuple] = set()
+        tmp_events: list[CalendarMergeEvent] = []
+
+        for event in events:
+            key: tuple = (
+                event.calendar,
+                event.summary,
+                event.description,
+                event.all_day,
+                None if event.all_day else event.start.time(),
+                (event.end - event.start).days if event.all_day else event.end.time(),
+            )
+
+            if key not in keys:
+                keys.add(key)
+                tmp_events.append(event)
+
+        return tmp_events
+
+    # ------------------------------------------------------
+    def format_date(
         self,
         date_time: datetime | date,
     ) -> str | None:
         """Format date."""
-        return self.format_date(date_time)
+        return event_format.format_date(date_time, self.formatter)
 
     # ------------------------------------------------------
     def format_time(
@@ -344,217 +1018,380 @@ class CalendarHandler:
         date_time: datetime | time,
     ) -> str | None:
         """Format time."""
-        return babel_format_time(
-            time=date_time,
-            format="short",
-            locale=self.language,
-        )
+        return event_format.format_time(date_time, self.formatter)
 
     # ------------------------------------------------------
-    @async_hass_add_executor_job()
-    def async_format_time(
+    def format_datetime(
         self,
-        date_time: datetime | time,
+        date_time: datetime | date,
     ) -> str | None:
-        """Format time."""
-        return self.format_time(date_time)
+        """Format datetime."""
+        return event_format.format_datetime(date_time, self.formatter)
 
     # ------------------------------------------------------
-    @async_hass_add_executor_job()
-    def async_format_datetime(
+    def format_timedelta(
         self,
-        date_time: datetime | date,
+        seconds: float,
     ) -> str | None:
-        """Format datetime."""
+        """Format timedelte."""
+        return event_format.format_timedelta(round(seconds), self.formatter)
+
+    # ------------------------------------------------------
+    def format_event_fields(
+        self,
+        event: CalendarMergeEvent,
+        now: float,
+        format_fields: Collection[str] = SNAPSHOT_FORMATTED_FIELDS,
+    ) -> dict[str, str]:
+        """Format the date and time fields of an event.
+
+        Only the given fields are formatted, default is all fields.
+        """
+
+        event_time_field: str = (
+            "formatted_time_to" if self.show_event_as_time_to else "formatted_start"
+        )
+
+        if "formatted_event_time" in format_fields:
+            format_fields = {*format_fields, event_time_field}
+
+        fields: dict[str, str] = {}
+
+        if "formatted_start" in format_fields:
+            fields["formatted_start"] = self.format_datetime(event.start)
+
+        if "formatted_start_date" in format_fields:
+            fields["formatted_start_date"] = self.format_date(event.start)
+
+        if "formatted_end" in format_fields:
+            fields["formatted_end"] = self.format_datetime(event.end)
+
+        if "formatted_end_date" in format_fields:
+            fields["formatted_end_date"] = self.format_date(event.end)
+
+        if "formatted_start_time" in format_fields:
+            fields["formatted_start_time"] = self.format_time(
+                time(0, 0) if event.all_day else event.start
+            )
+
+        if "formatted_end_time" in format_fields:
+            fields["formatted_end_time"] = self.format_time(
+                time(23, 59) if event.all_day else event.end
+            )
+
+        if "formatted_time_to" in format_fields:
+            diff: float = event.start_key - now
+
+            if event.all_day and diff < 0:
+                fields["formatted_time_to"] = self.formatter.now
+            else:
+                fields["formatted_time_to"] = self.format_timedelta(diff)
+
+        if "formatted_event_time" in format_fields:
+            fields["formatted_event_time"] = fields[event_time_field]
 
-        date_str: str = self.format_date(date_time)
+        return fields
 
-        if type(date_time) is date:
-            return date_str
+    # ------------------------------------------------------
+    def uses_formatted_time_to(self) -> bool:
+        """Is the formatted time to an event used by the templates."""
 
-        time_str: str = self.format_time(date_time)
+        format_fields: frozenset[str] = self.get_format_fields()
 
-        dt_format = babel_get_datetime_format(
-            self.entry.options.get(CONF_FORMAT_DATE, "medium"), self.language
+        return "formatted_time_to" in format_fields or (
+            self.show_event_as_time_to and "formatted_event_time" in format_fields
         )
 
-        return dt_format.format(time_str, date_str)
+    # ------------------------------------------------------
+    def get_format_fields(self) -> frozenset[str]:
+        """Get the formatted fields used by the templates."""
+
+        format_fields: set[str] = set()
+
+        for conf_key, default, variables in (
+            (
+                CONF_EVENT_TEMPLATE,
+                CONF_EVENT_TEMPLATE_DEFAULT,
+                EVENT_TEMPLATE_VARIABLES,
+            ),
+            (CONF_MD_HEADER_TEMPLATE, "", ()),
+            (CONF_MD_ITEM_TEMPLATE, "", MD_ITEM_TEMPLATE_VARIABLES),
+        ):
+            value_template = self.get_template(conf_key, default, variables)
+
+            if value_template is None:
+                continue
+
+            if (template_variables := get_template_variables(value_template)) is None:
+                return frozenset(SNAPSHOT_FORMATTED_FIELDS)
+
+            format_fields.update(template_variables)
+
+        return format_fields.intersection(SNAPSHOT_FORMATTED_FIELDS)
 
     # ------------------------------------------------------
     @async_hass_add_executor_job()
-    def async_format_timedelta(
+    def async_format_events_fields(
         self,
-        time_delta: timedelta,
-    ) -> str | None:
-        """Format timedelte."""
+        events: list[CalendarMergeEvent],
+        now: float,
+        format_fields: Collection[str],
+    ) -> list[dict[str, str]]:
+        """Format the date and time fields of all events in one executor job."""
 
-        return babel_format_timedelta(
-            time_delta,
-            add_direction=True,
-            locale=self.language,
-        )
+        return [
+            self.format_event_fields(event, now, format_fields) for event in events
+        ]
 
     # ------------------------------------------------------
-    async def async_format_event(self, event_num: int) -> str | None:
-        """Format event."""
+    async def async_format_events(self, events: list[CalendarMergeEvent]) -> None:
+        """Format events.
 
-        if event_num < len(self.events):
-            tmp_event = self.events[event_num]
+        The babel formatting of all events is done in one executor job, and the
+        event template is rendered afterwards in the event loop. Only the fields
+        used by the templates are formatted, the others are left empty. The
+        formatted fields are only set on the given events.
+        """
 
-            tmp_event.formatted_start = await self.async_format_datetime(
-                tmp_event.start
-            )
-            tmp_event.formatted_start_date = await self.async_format_date(
-                tmp_event.start
-            )
-            tmp_event.formatted_end = await self.async_format_datetime(tmp_event.end)
-            tmp_event.formatted_end_date = await self.async_format_date(tmp_event.end)
+        events = list(events)
 
-            if not tmp_event.all_day:
-                tmp_event.formatted_start_time = await self.async_format_time(
-                    tmp_event.start
-                )
-                tmp_event.formatted_end_time = await self.async_format_time(
-                    tmp_event.end
-                )
-            else:
-                tmp_event.formatted_start_time = await self.async_format_time(
-                    time(0, 0)
-                )
-                tmp_event.formatted_end_time = await self.async_format_time(
-                    time(23, 59)
-                )
+        events_fields: list[dict[str, str]] = await self.async_format_events_fields(
+            events, dt_util.now().timestamp(), self.get_format_fields()
+        )
 
-            diff: timedelta = tmp_event.start_datetime_local - dt_util.now()
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("Format cache: %s", event_format.get_format_cache_info())
 
-            if tmp_event.all_day and diff.total_seconds() < 0:
-                tmp_event.formatted_time_to = (
-                    get_locale(self.language).timeframes.get("now", "now").capitalize()
-                )
+        for tmp_event, fields in zip(events, events_fields, strict=True):
+            for key in SNAPSHOT_FORMATTED_FIELDS[:-1]:
+                setattr(tmp_event, key, fields.get(key, ""))
 
-            else:
-                tmp_event.formatted_time_to = await self.async_format_timedelta(diff)
+            tmp_event.formatted_event = self.render_event_template(tmp_event)
 
-            if self.show_event_as_time_to:
-                tmp_event.formatted_event_time = tmp_event.formatted_time_to
-            else:
-                tmp_event.formatted_event_time = tmp_event.formatted_start
-
-            try:
-                value_template: Template | None = Template(
-                    str(
-                        self.entry.options.get(
-                            CONF_EVENT_TEMPLATE, CONF_EVENT_TEMPLATE_DEFAULT
-                        )
-                    ),
-                    self.hass,
-                )
-                values = {
-                    "calendar": tmp_event.calendar,
-                    "start": tmp_event.start.isoformat(),
-                    "end": tmp_event.end.isoformat(),
-                    "all_day": tmp_event.all_day,
-                    "summary": tmp_event.summary,
-                    "description": tmp_event.description,
-                    "location": tmp_event.location,
-                    "formatted_start": tmp_event.formatted_start,
-                    "formatted_start_date": tmp_event.formatted_start_date,
-                    "formatted_start_time": tmp_event.formatted_start_time,
-                    "formatted_end": tmp_event.formatted_end,
-                    "formatted_end_date": tmp_event.formatted_end_date,
-                    "formatted_end_time": tmp_event.formatted_end_time,
-                    "formatted_time_to": tmp_event.formatted_time_to,
-                    "formatted_event_time": tmp_event.formatted_event_time,
-                }
+    # ------------------------------------------------------
+    def get_template(
+        self, conf_key: str, default: str = "", variables: tuple[str, ...] = ()
+    ) -> Template | FastTemplate | None:
+        """Get the compiled template of an option.
 
-                formatted_event_str = value_template.async_render(values)
+        The template is compiled once and reused until the option changes.
+        Templates with only literal text and the given variables are rendered
+        without Jinja. None is returned if the template can not be compiled,
+        the error is only reported once.
+        """
 
-            except (TypeError, TemplateError) as e:
-                self.create_issue_template(
-                    str(e), value_template.template, TRANSLATION_KEY_TEMPLATE_ERROR
-                )
-                return ""
+        source: str = str(self.entry.options.get(conf_key, default))
+        tmp_source, value_template = self.templates.get(conf_key, (None, None))
 
-            tmp_event.formatted_event = formatted_event_str
-            self.events[event_num] = tmp_event
+        if tmp_source == source:
+            return value_template
 
-            return formatted_event_str
+        if (value_template := FastTemplate.parse(source, variables)) is not None:
+            self.templates[conf_key] = (source, value_template)
+            return value_template
 
-        return None
+        value_template = Template(source, self.hass)
 
-    # ------------------------------------------------------------------
-    def create_markdown(self) -> str:
-        """Create markdown."""
+        try:
+            value_template.ensure_valid()
+        except TemplateError as e:
+            self.create_issue_template(str(e), source, TRANSLATION_KEY_TEMPLATE_ERROR)
+            value_template = None
 
-        # ------------------------------------------------------------------
-        def replace_markdown_tags(txt: str) -> str:
-            """Replace markdown tags."""
+        self.templates[conf_key] = (source, value_template)
+        return value_template
+
+    # ------------------------------------------------------
+    def render_event_template(self, tmp_event: CalendarMergeEvent) -> str:
+        """Render the event template."""
 
-            return txt.replace(".", "\\.").replace("-", "\\-").replace("+", "\\+")
+        if (
+            value_template := self.get_template(
+                CONF_EVENT_TEMPLATE,
+                CONF_EVENT_TEMPLATE_DEFAULT,
+                EVENT_TEMPLATE_VARIABLES,
+            )
+        ) is None:
+            return ""
 
         try:
-            tmp_md: str = ""
-            values: dict[str, Any] = {}
+            values = {
+                "calendar": tmp_event.calendar,
+                "start": tmp_event.start.isoformat(),
+                "end": tmp_event.end.isoformat(),
+                "all_day": tmp_event.all_day,
+                "summary": tmp_event.summary,
+                "description": tmp_event.description,
+                "location": tmp_event.location,
+                "formatted_start": tmp_event.formatted_start,
+                "formatted_start_date": tmp_event.formatted_start_date,
+                "formatted_start_time": tmp_event.formatted_start_time,
+                "formatted_end": tmp_event.formatted_end,
+                "formatted_end_date": tmp_event.formatted_end_date,
+                "formatted_end_time": tmp_event.formatted_end_time,
+                "formatted_time_to": tmp_event.formatted_time_to,
+                "formatted_event_time": tmp_event.formatted_event_time,
+            }
+
+            return value_template.async_render(values)
 
-            if self.entry.options.get(CONF_MD_HEADER_TEMPLATE, "") != "":
-                value_template: Template | None = Template(
-                    str(self.entry.options.get(CONF_MD_HEADER_TEMPLATE, "")),
-                    self.hass,
-                )
+        except (TypeError, TemplateError) as e:
+            self.create_issue_template(
+                str(e), value_template.template, TRANSLATION_KEY_TEMPLATE_ERROR
+            )
+            return ""
 
-                tmp_md = value_template.async_render({})
+    # ------------------------------------------------------
+    def get_formatted_events(self, count: int) -> list[str | None]:
+        """Get the formatted events for the first count event sensors."""
 
-            for item in self.events:
-                value_template: Template | None = Template(
-                    str(self.entry.options.get(CONF_MD_ITEM_TEMPLATE, "")),
-                    self.hass,
-                )
-                values = {
-                    "calendar": replace_markdown_tags(item.calendar),
-                    "start": replace_markdown_tags(item.start.isoformat()),
-                    "end": replace_markdown_tags(item.end.isoformat()),
-                    "all_day": item.all_day,
-                    "summary": replace_markdown_tags(item.summary),
-                    "description": replace_markdown_tags(item.description),
-                    "location": replace_markdown_tags(item.location),
-                    "formatted_start": replace_markdown_tags(item.formatted_start),
-                    "formatted_start_date": replace_markdown_tags(
-                        item.formatted_start_date
-                    ),
-                    "formatted_start_time": replace_markdown_tags(
-                        item.formatted_start_time
-                    ),
-                    "formatted_end": replace_markdown_tags(item.formatted_end),
-                    "formatted_end_date": replace_markdown_tags(
-                        item.formatted_end_date
-                    ),
-                    "formatted_end_time": replace_markdown_tags(
-                        item.formatted_end_time
-                    ),
-                    "formatted_time_to": replace_markdown_tags(item.formatted_time_to),
-                    "formatted_event": replace_markdown_tags(item.formatted_event),
-                    "formatted_event_time": replace_markdown_tags(
-                        item.formatted_event_time
-                    ),
-                }
-                tmp_md += value_template.async_render(values)
+        formatted_events: list[str | None] = [
+            event.formatted_event for event in self.events[:count]
+        ]
+        formatted_events.extend([None] * (count - len(formatted_events)))
+
+        return formatted_events
+
+    # ------------------------------------------------------------------
+    def create_markdown(self) -> str:
+        """Create markdown.
+
+        The markdown of each event is cached, keyed by the event fingerprint, so
+        only new or changed events are rendered. A header not depending on
+        anything is only rendered when the header template changes.
+        """
 
-            tmp_md = tmp_md.replace("<br>", "\r")
+        fragments: list[str] = []
+        markdown_fragments: dict[tuple[Any, ...], str] = {}
+        values: dict[str, Any] = {}
+        value_template: Template | FastTemplate | None = None
+
+        try:
+            if self.entry.options.get(CONF_MD_HEADER_TEMPLATE, "") != "" and (
+                value_template := self.get_template(CONF_MD_HEADER_TEMPLATE)
+            ):
+                if self.markdown_header[0] is value_template:
+                    fragments.append(self.markdown_header[1])
+                else:
+                    fragments.append(str(value_template.async_render({})))
+
+                    if is_static_template(value_template, ()):
+                        self.markdown_header = (value_template, fragments[-1])
+
+            value_template = self.get_template(
+                CONF_MD_ITEM_TEMPLATE, variables=MD_ITEM_TEMPLATE_VARIABLES
+            )
+            static_item: bool = value_template is not None and is_static_template(
+                value_template, MD_ITEM_TEMPLATE_VARIABLES
+            )
+
+            for item in self.events if value_template is not None else []:
+                key: tuple[Any, ...] = (value_template.template, *item.fingerprint())
+
+                if (fragment := self.markdown_fragments.get(key)) is None:
+                    values = {
+                        "calendar": escape_markdown(item.calendar),
+                        "start": escape_markdown(item.start.isoformat()),
+                        "end": escape_markdown(item.end.isoformat()),
+                        "all_day": item.all_day,
+                        "summary": escape_markdown(item.summary),
+                        "description": escape_markdown(item.description),
+                        "location": escape_markdown(item.location),
+                        "formatted_start": escape_markdown(item.formatted_start),
+                        "formatted_start_date": escape_markdown(
+                            item.formatted_start_date
+                        ),
+                        "formatted_start_time": escape_markdown(
+                            item.formatted_start_time
+                        ),
+                        "formatted_end": escape_markdown(item.formatted_end),
+                        "formatted_end_date": escape_markdown(item.formatted_end_date),
+                        "formatted_end_time": escape_markdown(item.formatted_end_time),
+                        "formatted_time_to": escape_markdown(item.formatted_time_to),
+                        "formatted_event": escape_markdown(item.formatted_event),
+                        "formatted_event_time": escape_markdown(
+                            item.formatted_event_time
+                        ),
+                    }
+                    fragment = str(value_template.async_render(values))
+
+                if static_item:
+                    markdown_fragments[key] = fragment
+
+                fragments.append(fragment)
 
         except (TypeError, TemplateError) as e:
             self.create_issue_template(
                 str(e), value_template.template, TRANSLATION_KEY_TEMPLATE_ERROR
             )
 
-        return tmp_md
+        self.markdown_fragments = markdown_fragments
+        self.markdown_text = "".join(fragments).replace("<br>", "\r")
+        return self.markdown_text
 
     # ------------------------------------------------------------------
-    def get_events_to_att(
-        self,
-    ) -> list[CalendarAttrEvent]:
-        """Create list of events to attribute."""
+    def get_events_attributes(self) -> dict[str, Any]:
+        """Get the events attributes.
+
+        The attributes and their JSON are cached until the events change.
+        """
+
+        if self.events_attributes_events is not None and (
+            len(self.events_attributes_events) == len(self.events)
+            and all(
+                cached_event is event
+                for cached_event, event in zip(
+                    self.events_attributes_events, self.events, strict=True
+                )
+            )
+        ):
+            return self.events_attributes
+
+        if self.entry.options.get(CONF_COMPACT_EVENTS_ATTRIBUTE, False):
+            self.events_attributes = self.create_compact_events_attributes()
+        else:
+            self.events_attributes = {
+                "events": [CalendarAttrEvent(event) for event in self.events]
+            }
+
+        self.events_attributes_events = list(self.events)
+        self.events_attributes_json = json_bytes(self.events_attributes)
+
+        return self.events_attributes
+
+    # ------------------------------------------------------------------
+    def create_compact_events_attributes(self) -> dict[str, Any]:
+        """Create compact events attributes.
+
+        Start and end are epoch timestamps, and the calendar is an index into
+        the calendars attribute. Descriptions are truncated if a max length is set.
+        """
+
+        max_length: int = int(
+            self.entry.options.get(CONF_EVENTS_DESCRIPTION_MAX_LENGTH, 0)
+        )
+        calendars: dict[str, int] = {}
+        events: list[dict[str, Any]] = []
+
+        for event in self.events:
+            description: str = event.description or ""
+
+            if max_length > 0 and len(description) > max_length:
+                description = description[: max_length - 1] + "…"
+
+            events.append(
+                {
+                    "calendar": calendars.setdefault(event.calendar, len(calendars)),
+                    "start": event.start_key,
+                    "end": event.end_key,
+                    "all_day": event.all_day,
+                    "summary": event.summary,
+                    "description": description,
+                    "location": event.location or "",
+                }
+            )
 
-        return [CalendarAttrEvent(event) for event in self.events]
+        return {"calendars": list(calendars), "events": events}
 
     # ------------------------------------------------------------------
     def create_issue_template(
@@ -30,12 +30,16 @@ from homeassistant.helpers.selector import (
 )
 
 from .const import (
+    CALENDAR_TIMEOUT_DEFAULT,
     CONF_CALENDAR_ENTITY_IDS,
+    CONF_CALENDAR_TIMEOUT,
+    CONF_COMPACT_EVENTS_ATTRIBUTE,
     CONF_DAYS_AHEAD,
     CONF_DEFAULT_MD_HEADER_TEMPLATE,
     CONF_DEFAULT_MD_ITEM_TEMPLATE,
     CONF_EVENT_TEMPLATE,
     CONF_EVENT_TEMPLATE_DEFAULT,
+    CONF_EVENTS_DESCRIPTION_MAX_LENGTH,
     CONF_FORMAT_DATE,
     CONF_FORMAT_DATE_FULL,
     CONF_FORMAT_DATE_LONG,
@@ -44,6 +48,7 @@ from .const import (
     CONF_MAX_EVENTS,
     CONF_MD_HEADER_TEMPLATE,
     CONF_MD_ITEM_TEMPLATE,
+    CONF_REFRESH_ON_CALENDAR_CHANGE,
     CONF_REMOVE_RECURRING_EVENTS,
     CONF_USE_SUMMARY_AS_ENTITY_NAME,
     DOMAIN,
@@ -107,10 +112,27 @@ async def config_option_dict(handler: SchemaCommonFlowHandler) -> dict[str, Any]
                 unit_of_measurement="events",
             )()
         ),
+        vol.Required(
+            CONF_CALENDAR_TIMEOUT,
+            default=CALENDAR_TIMEOUT_DEFAULT,
+        ): NumberSelector(
+            await NumberSelectorConfigTranslate(
+                handler.parent_handler.hass,
+                min=1,
+                max=300,
+                step="any",
+                mode=NumberSelectorMode.BOX,
+                unit_of_measurement="seconds",
+            )()
+        ),
         vol.Required(
             CONF_REMOVE_RECURRING_EVENTS,
             default=True,
         ): BooleanSelector(),
+        vol.Required(
+            CONF_REFRESH_ON_CALENDAR_CHANGE,
+            default=False,
+        ): BooleanSelector(),
         vol.Required(
             CONF_CALENDAR_ENTITY_IDS,
             default=[],
@@ -186,6 +208,23 @@ async def format_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
             ): TextSelector(
                 TextSelectorConfig(multiline=True, type=TextSelectorType.TEXT)
             ),
+            vol.Required(
+                CONF_COMPACT_EVENTS_ATTRIBUTE,
+                default=False,
+            ): BooleanSelector(),
+            vol.Required(
+                CONF_EVENTS_DESCRIPTION_MAX_LENGTH,
+                default=0,
+            ): NumberSelector(
+                await NumberSelectorConfigTranslate(
+                    handler.parent_handler.hass,
+                    min=0,
+                    max=10000,
+                    step=1,
+                    mode=NumberSelectorMode.BOX,
+                    unit_of_measurement="characters",
+                )()
+            ),
         }
     )
 
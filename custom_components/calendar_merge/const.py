@@ -1,5 +1,6 @@
 """Constants for Calendar merge integration."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 DOMAIN = "calendar_merge"
@@ -14,7 +15,13 @@ TRANSLATION_KEY_SWITCH_SHOW_AS_TIME_TO = "switch_show_as_time_to"
 CONF_DAYS_AHEAD = "days_ahead"
 CONF_MAX_EVENTS = "max_events"
 CONF_CALENDAR_ENTITY_IDS = "calender_entity_ids"
+CONF_CALENDAR_TIMEOUT = "calendar_timeout"
+CALENDAR_TIMEOUT_DEFAULT = 30
+CALENDAR_CACHE_TTL = timedelta(hours=1)
+CALENDAR_FETCH_TTL = timedelta(minutes=2)
+CALENDAR_RANGE_CACHE_SIZE = 16
 CONF_REMOVE_RECURRING_EVENTS = "remove_recurring_events"
+CONF_REFRESH_ON_CALENDAR_CHANGE = "refresh_on_calendar_change"
 CONF_FORMAT_DATE = "format_date"
 CONF_FORMAT_DATE_FULL = "full"
 CONF_FORMAT_DATE_LONG = "long"
@@ -32,4 +39,12 @@ CONF_DEFAULT_MD_ITEM_TEMPLATE = "defaults.default_md_item_template"
 CONF_EVENT_TEMPLATE = "event_template"
 CONF_EVENT_TEMPLATE_DEFAULT = "{{ formatted_event_time }} - {{ summary }}"
 
+CONF_COMPACT_EVENTS_ATTRIBUTE = "compact_events_attribute"
+CONF_EVENTS_DESCRIPTION_MAX_LENGTH = "events_description_max_length"
+
 SERVICE_SAVE_SETTINGS = "save_settings"
+
+REFRESH_INTERVAL = timedelta(minutes=5)
+REFRESH_INTERVAL_ON_CALENDAR_CHANGE = timedelta(minutes=30)
+REFRESH_BATCH_DELAY = timedelta(seconds=1)
+MAX_CONCURRENT_REFRESHES = 2
@@ -0,0 +1,171 @@
+"""Cached babel formatting shared by all calendar merge helpers."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+from functools import lru_cache
+
+from arrow.locales import get_locale
+from babel import Locale
+from babel.dates import (
+    DateTimePattern,
+    format_timedelta as babel_format_timedelta,
+    get_date_format as babel_get_date_format,
+    get_datetime_format as babel_get_datetime_format,
+    get_time_format as babel_get_time_format,
+    parse_pattern as babel_parse_pattern,
+)
+
+FORMAT_CACHE_SIZE = 2048
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class EventFormatter:
+    """Babel locale and preparsed patterns for a date format and language.
+
+    Use get_event_formatter, so helpers with the same date format and language
+    share the formatter and the format cache. The formatter is part of the
+    format cache keys, so entries of other formats and languages are not used,
+    and are evicted from the cache when no longer used.
+    """
+
+    def __init__(self, format: str, language: str) -> None:
+        """Init."""
+
+        self.format: str = format
+        self.language: str = language
+        self.locale: Locale = Locale.parse(language.replace("-", "_"))
+
+        self.date_pattern: DateTimePattern = babel_parse_pattern(
+            babel_get_date_format(format, self.locale)
+        )
+        self.time_pattern: DateTimePattern = babel_parse_pattern(
+            babel_get_time_format("short", self.locale)
+        )
+        self.datetime_format: str = babel_get_datetime_format(format, self.locale)
+
+        try:
+            self.now: str = (
+                get_locale(language).timeframes.get("now", "now").capitalize()
+            )
+        except ValueError:
+            self.now = "Now"
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=32)
+def get_event_formatter(format: str, language: str) -> EventFormatter:
+    """Get the event formatter for a date format and language."""
+    return EventFormatter(format, language)
+
+
+# ------------------------------------------------------
+def get_utcoffset(value: datetime | date | time) -> timedelta | None:
+    """Get the UTC offset of a value, None for dates and naive values.
+
+    Aware datetimes are equal for the same instant in any time zone, so the
+    offset is added to the format cache keys.
+    """
+
+    if isinstance(value, datetime | time):
+        return value.utcoffset()
+
+    return None
+
+
+# ------------------------------------------------------
+def format_date(value: datetime | date, formatter: EventFormatter) -> str:
+    """Format date."""
+    return cached_format_date(value, get_utcoffset(value), formatter)
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def cached_format_date(
+    value: datetime | date, utcoffset: timedelta | None, formatter: EventFormatter
+) -> str:
+    """Format date, cached by value, UTC offset and formatter."""
+
+    if isinstance(value, datetime):
+        value = value.date()
+
+    return formatter.date_pattern.apply(value, formatter.locale)
+
+
+# ------------------------------------------------------
+def format_time(value: datetime | time, formatter: EventFormatter) -> str:
+    """Format time."""
+    return cached_format_time(value, get_utcoffset(value), formatter)
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def cached_format_time(
+    value: datetime | time, utcoffset: timedelta | None, formatter: EventFormatter
+) -> str:
+    """Format time, cached by value, UTC offset and formatter."""
+
+    reference_date: date | None = None
+
+    if isinstance(value, datetime):
+        reference_date = value.date()
+        value = value.timetz()
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+
+    return formatter.time_pattern.apply(
+        value, formatter.locale, reference_date=reference_date
+    )
+
+
+# ------------------------------------------------------
+def format_datetime(value: datetime | date, formatter: EventFormatter) -> str:
+    """Format datetime as formatted date and short time."""
+    return cached_format_datetime(value, get_utcoffset(value), formatter)
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def cached_format_datetime(
+    value: datetime | date, utcoffset: timedelta | None, formatter: EventFormatter
+) -> str:
+    """Format datetime, cached by value, UTC offset and formatter."""
+
+    date_str: str = format_date(value, formatter)
+
+    if type(value) is date:
+        return date_str
+
+    return formatter.datetime_format.format(format_time(value, formatter), date_str)
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_timedelta(seconds: int, formatter: EventFormatter) -> str:
+    """Format timedelta in whole seconds."""
+    return babel_format_timedelta(
+        timedelta(seconds=seconds), add_direction=True, locale=formatter.locale
+    )
+
+
+# ------------------------------------------------------
+def get_format_cache_info() -> dict[str, int]:
+    """Get hits and misses of the format cache."""
+
+    cache_infos = [
+        func.cache_info()
+        for func in (
+            cached_format_date,
+            cached_format_time,
+            cached_format_datetime,
+            format_timedelta,
+        )
+    ]
+
+    return {
+        "hits": sum(cache_info.hits for cache_info in cache_infos),
+        "misses": sum(cache_info.misses for cache_info in cache_infos),
+        "size": sum(cache_info.currsize for cache_info in cache_infos),
+    }
@@ -0,0 +1,83 @@
+"""Interval index for range queries on the merged events."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.components.calendar import CalendarEvent
+
+if TYPE_CHECKING:
+    from .calendar_handler import CalendarMergeEvent
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class EventIndex:
+    """Interval index of events sorted by start.
+
+    The start epochs are kept sorted together with the running max of the end
+    epochs, so a range query only scans the events which can overlap the range.
+    The calendar events returned are the ones cached on the merge events.
+    """
+
+    def __init__(self, events: Sequence[CalendarMergeEvent]) -> None:
+        """Init."""
+
+        self.events: list[CalendarMergeEvent] = list(events)
+        self.calendar_events: list[CalendarEvent] = [
+            event.as_calender_event() for event in self.events
+        ]
+        self.start_keys: list[int] = [event.start_key for event in self.events]
+        self.max_end_keys: list[int] = list(
+            accumulate((event.end_key for event in self.events), max)
+        )
+
+    # ------------------------------------------------------
+    def __len__(self) -> int:
+        """Number of events."""
+        return len(self.events)
+
+    # ------------------------------------------------------
+    def get_range(
+        self,
+        start_key: float,
+        end_key: float,
+        min_start_key: float = -math.inf,
+        max_end_key: float = math.inf,
+    ) -> list[CalendarEvent]:
+        """Get the calendar events overlapping the range from start to end.
+
+        Use min_start_key and max_end_key to only get the events starting at or
+        after, and ending at or before, those keys.
+        """
+
+        # Events before first all end before the range or start too early
+        first: int = max(
+            bisect_left(self.max_end_keys, start_key),
+            bisect_left(self.start_keys, min_start_key),
+        )
+        # Events from last all start after the range
+        last: int = bisect_right(self.start_keys, end_key, lo=first)
+
+        calendar_events: list[CalendarEvent] = []
+
+        for index in range(first, last):
+            event_start: int = self.start_keys[index]
+            event_end: int = self.events[index].end_key
+
+            if event_end > max_end_key:
+                continue
+
+            if (
+                start_key <= event_start < end_key
+                or start_key < event_end <= end_key
+                or event_start <= start_key < event_end
+                or event_start < end_key <= event_end
+            ):
+                calendar_events.append(self.calendar_events[index])
+
+        return calendar_events
@@ -0,0 +1,235 @@
+"""Fast rendering of templates with only literal text and bare variables."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+import re
+from typing import Any
+
+from jinja2 import Environment, TemplateSyntaxError, meta, nodes
+
+from homeassistant.helpers.template import Template
+
+RE_VARIABLE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+JINJA_TAGS: tuple[str, ...] = ("{{", "}}", "{%", "%}", "{#", "#}")
+JINJA_ENVIRONMENT = Environment(extensions=["jinja2.ext.loopcontrols", "jinja2.ext.do"])
+
+# Functions, filters and tests only depending on their arguments. Others, like
+# the Home Assistant states, now and area_name, make a template dynamic. Filters
+# and tests taking the name of another filter or test, like map, are left out.
+PURE_FUNCTIONS: frozenset[str] = frozenset({"dict", "namespace", "range"})
+PURE_FILTERS: frozenset[str] = frozenset(
+    {
+        "abs",
+        "attr",
+        "batch",
+        "capitalize",
+        "center",
+        "count",
+        "d",
+        "default",
+        "dictsort",
+        "e",
+        "escape",
+        "first",
+        "float",
+        "forceescape",
+        "format",
+        "from_json",
+        "groupby",
+        "indent",
+        "int",
+        "items",
+        "join",
+        "last",
+        "length",
+        "list",
+        "lower",
+        "max",
+        "min",
+        "regex_findall",
+        "regex_findall_index",
+        "regex_match",
+        "regex_replace",
+        "regex_search",
+        "replace",
+        "reverse",
+        "round",
+        "safe",
+        "slice",
+        "slugify",
+        "sort",
+        "string",
+        "striptags",
+        "sum",
+        "title",
+        "to_json",
+        "tojson",
+        "trim",
+        "truncate",
+        "unique",
+        "upper",
+        "urlencode",
+        "wordcount",
+        "wordwrap",
+    }
+)
+PURE_TESTS: frozenset[str] = frozenset(
+    {
+        "boolean",
+        "defined",
+        "divisibleby",
+        "eq",
+        "equalto",
+        "even",
+        "false",
+        "float",
+        "ge",
+        "gt",
+        "in",
+        "integer",
+        "iterable",
+        "le",
+        "lower",
+        "lt",
+        "mapping",
+        "match",
+        "ne",
+        "none",
+        "number",
+        "odd",
+        "sameas",
+        "search",
+        "sequence",
+        "string",
+        "true",
+        "undefined",
+        "upper",
+    }
+)
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class FastTemplate:
+    """Template consisting only of literal text and {{ variable }} substitutions.
+
+    The template is rendered by joining the literal text and the variable values,
+    giving the same result as the Home Assistant template without the Jinja
+    overhead. Use parse to get a FastTemplate, None is returned if the template
+    needs Jinja.
+    """
+
+    def __init__(self, template: str, literals: list[str], names: list[str]) -> None:
+        """Init."""
+
+        self.template: str = template
+        self.literals: list[str] = literals
+        self.names: list[str] = names
+
+    # ------------------------------------------------------
+    @classmethod
+    def parse(cls, template: str, variables: Iterable[str]) -> FastTemplate | None:
+        """Parse template, returns None if the template needs Jinja."""
+
+        parts: list[str] = RE_VARIABLE.split(template)
+        literals: list[str] = parts[0::2]
+        names: list[str] = parts[1::2]
+
+        if any(tag in literal for literal in literals for tag in JINJA_TAGS):
+            return None
+
+        if not set(names).issubset(variables):
+            return None
+
+        return cls(template, literals, names)
+
+    # ------------------------------------------------------
+    def async_render(self, variables: dict[str, Any]) -> str:
+        """Render template."""
+
+        result: list[str] = [self.literals[0]]
+
+        for name, literal in zip(self.names, self.literals[1:], strict=True):
+            result.append(str(variables[name]) if name in variables else "")
+            result.append(literal)
+
+        # Home Assistant strips the rendered template
+        return "".join(result).strip()
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=32)
+def get_jinja_variables(template: str) -> frozenset[str] | None:
+    """Get the variables used by a Jinja template, None if unknown."""
+
+    try:
+        return frozenset(
+            meta.find_undeclared_variables(JINJA_ENVIRONMENT.parse(template))
+        )
+    except TemplateSyntaxError:
+        return None
+
+
+# ------------------------------------------------------
+@lru_cache(maxsize=32)
+def is_pure_jinja_template(template: str) -> bool:
+    """Is the Jinja template only using pure functions, filters and tests.
+
+    Method calls on values are allowed, calls of other names are not.
+    """
+
+    try:
+        parsed: nodes.Template = JINJA_ENVIRONMENT.parse(template)
+    except TemplateSyntaxError:
+        return False
+
+    for node in parsed.find_all((nodes.Call, nodes.Filter, nodes.Test)):
+        if isinstance(node, nodes.Call):
+            if isinstance(node.node, nodes.Name) and (
+                node.node.name not in PURE_FUNCTIONS
+            ):
+                return False
+
+        elif isinstance(node, nodes.Filter):
+            if node.name not in PURE_FILTERS:
+                return False
+
+        elif node.name not in PURE_TESTS:
+            return False
+
+    return True
+
+
+# ------------------------------------------------------
+def get_template_variables(
+    value_template: Template | FastTemplate,
+) -> frozenset[str] | None:
+    """Get the variables used by a template, None if unknown."""
+
+    if isinstance(value_template, FastTemplate):
+        return frozenset(value_template.names)
+
+    return get_jinja_variables(value_template.template)
+
+
+# ------------------------------------------------------
+def is_static_template(
+    value_template: Template | FastTemplate, variables: Iterable[str]
+) -> bool:
+    """Is the template only depending on the given variables.
+
+    The result of a static template can be cached for the same variable values.
+    Templates calling functions or filters which can read state or time, like
+    states, now or area_name, are not static.
+    """
+
+    if (
+        template_variables := get_template_variables(value_template)
+    ) is None or not template_variables.issubset(variables):
+        return False
+
+    return isinstance(value_template, FastTemplate) or is_pure_jinja_template(
+        value_template.template
+    )
@@ -0,0 +1,205 @@
+"""Refresh scheduler shared by all calendar merge helpers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER, MAX_CONCURRENT_REFRESHES, REFRESH_BATCH_DELAY
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+@dataclass
+class ScheduledRefresh:
+    """Periodic refresh of a single helper."""
+
+    entry_id: str
+    interval: timedelta
+    refresh: Callable[[], Awaitable[None]]
+    next_boundary: Callable[[], datetime | None]
+    stagger_key: str
+    due: datetime
+    running: bool = False
+
+    # ------------------------------------------------------
+    def get_next_due(self, now: datetime) -> datetime:
+        """Get the next due time after now.
+
+        The due times are offset within the interval by a jitter derived from
+        the stagger key, so helpers are spread over the interval, also after a
+        restart. Helpers with the same stagger key are due at the same time.
+        """
+
+        interval: float = self.interval.total_seconds()
+        offset: float = zlib.crc32(self.stagger_key.encode()) % int(interval)
+
+        return dt_util.utc_from_timestamp(
+            (math.floor((now.timestamp() - offset) / interval) + 1) * interval
+            + offset
+        )
+
+    # ------------------------------------------------------
+    def get_priority(self) -> float:
+        """Get the priority, helpers with the nearest event boundary first."""
+
+        if (next_boundary := self.next_boundary()) is None:
+            return math.inf
+
+        return next_boundary.timestamp()
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class RefreshScheduler:
+    """Refresh scheduler.
+
+    Replaces an update interval per helper with a single timer for all
+    helpers. Helper refreshes are staggered with a deterministic jitter per
+    calendar set, so helpers watching the same calendars refresh together and
+    share the calendar fetches. The number of concurrent refreshes is limited,
+    and due helpers are started in order of their next event boundary.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent: int = MAX_CONCURRENT_REFRESHES
+    ) -> None:
+        """Init."""
+
+        self.hass: HomeAssistant = hass
+        self.entries: dict[str, ScheduledRefresh] = {}
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrent)
+        self.unsub_timer: CALLBACK_TYPE | None = None
+        self.timer_due: datetime | None = None
+
+    # ------------------------------------------------------
+    @callback
+    def register(
+        self,
+        entry_id: str,
+        interval: timedelta,
+        refresh: Callable[[], Awaitable[None]],
+        next_boundary: Callable[[], datetime | None],
+        calendar_entities: list[str] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Register the periodic refresh of a helper, returns an unregister function.
+
+        The refresh is staggered by the calendar entities, or by the entry id if
+        not given.
+        """
+
+        stagger_key: str = (
+            ",".join(sorted(calendar_entities)) if calendar_entities else entry_id
+        )
+        scheduled_refresh = ScheduledRefresh(
+            entry_id, interval, refresh, next_boundary, stagger_key, dt_util.utcnow()
+        )
+        scheduled_refresh.due = scheduled_refresh.get_next_due(dt_util.utcnow())
+        self.entries[entry_id] = scheduled_refresh
+        self.schedule_timer()
+
+        # ------------------------------------------------------
+        @callback
+        def unregister() -> None:
+            if self.entries.get(entry_id) is scheduled_refresh:
+                del self.entries[entry_id]
+                self.schedule_timer()
+
+        return unregister
+
+    # ------------------------------------------------------
+    @callback
+    def request_refresh(self, entry_id: str) -> None:
+        """Request a refresh of a helper soon.
+
+        Requests made within the batch delay, like from all helpers at startup,
+        are run together in order of priority.
+        """
+
+        if (scheduled_refresh := self.entries.get(entry_id)) is None:
+            return
+
+        scheduled_refresh.due = min(
+            scheduled_refresh.due, dt_util.utcnow() + REFRESH_BATCH_DELAY
+        )
+        self.schedule_timer()
+
+    # ------------------------------------------------------
+    @callback
+    def schedule_timer(self) -> None:
+        """Schedule the timer at the earliest due time."""
+
+        due: datetime | None = min(
+            (
+                scheduled_refresh.due
+                for scheduled_refresh in self.entries.values()
+                if not scheduled_refresh.running
+            ),
+            default=None,
+        )
+
+        if due == self.timer_due:
+            return
+
+        if self.unsub_timer is not None:
+            self.unsub_timer()
+            self.unsub_timer = None
+
+        self.timer_due = due
+
+        if due is not None:
+            self.unsub_timer = async_track_point_in_utc_time(
+                self.hass, self.async_run_due, due
+            )
+
+    # ------------------------------------------------------
+    async def async_run_due(self, _now: datetime) -> None:
+        """Start the due refreshes, nearest event boundary first."""
+
+        self.unsub_timer = None
+        self.timer_due = None
+        now: datetime = dt_util.utcnow()
+
+        due_refreshes: list[ScheduledRefresh] = sorted(
+            (
+                scheduled_refresh
+                for scheduled_refresh in self.entries.values()
+                if scheduled_refresh.due <= now and not scheduled_refresh.running
+            ),
+            key=ScheduledRefresh.get_priority,
+        )
+
+        # The semaphore is acquired in the order the tasks are started
+        for scheduled_refresh in due_refreshes:
+            scheduled_refresh.running = True
+            self.hass.async_create_background_task(
+                self.async_run_refresh(scheduled_refresh),
+                f"calendar_merge refresh {scheduled_refresh.entry_id}",
+            )
+
+        self.schedule_timer()
+
+    # ------------------------------------------------------
+    async def async_run_refresh(self, scheduled_refresh: ScheduledRefresh) -> None:
+        """Run a refresh, limited by the number of concurrent refreshes."""
+
+        try:
+            async with self.semaphore:
+                if self.entries.get(scheduled_refresh.entry_id) is scheduled_refresh:
+                    await scheduled_refresh.refresh()
+
+        except Exception:  # noqa: BLE001
+            LOGGER.exception("Error refreshing %s", scheduled_refresh.entry_id)
+
+        finally:
+            scheduled_refresh.running = False
+            scheduled_refresh.due = scheduled_refresh.get_next_due(dt_util.utcnow())
+            self.schedule_timer()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from functools import cached_property
 from typing import Any
@@ -10,7 +12,7 @@ from typing import Any
 from homeassistant.components.fan import FanEntityFeature
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import MATCH_ALL
-from homeassistant.core import Event, HomeAssistant, ServiceCall
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import (
     # config_validation as cv,
     entity_registry as er,
@@ -19,7 +21,14 @@ from homeassistant.helpers import (
 )
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    EventEntityRegistryUpdatedData,
+    EventStateChangedData,
+    async_track_entity_registry_updated_event,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
 from . import CommonConfigEntry
 from .calendar_handler import CalendarHandler
@@ -30,9 +39,14 @@ from .const import (
     CONF_USE_SUMMARY_AS_ENTITY_NAME,
     DOMAIN,
     DOMAIN_NAME,
+    REFRESH_INTERVAL,
+    REFRESH_INTERVAL_ON_CALENDAR_CHANGE,
     # SERVICE_SAVE_SETTINGS,
     TRANSLATION_KEY,
 )
+from .hass_util import PointInUTCTimeTrigger
+from .refresh_scheduler import RefreshScheduler
+from .state_write_filter import StateWriteFilter
 
 
 # ------------------------------------------------------
@@ -94,10 +108,6 @@ async def async_setup_entry(
 class BaseCalendarMergeSensor:
     """Base sensor class for calendar events."""
 
-    # ------------------------------------------------------
-    async def async_refresh(self) -> None:
-        """Refresh."""
-
     # ------------------------------------------------------
     async def async_toggle_show_as_time_to(self, service_data: ServiceCall) -> None:
         """Toggle show time as time to."""
@@ -105,7 +115,7 @@ class BaseCalendarMergeSensor:
 
 # ------------------------------------------------------
 # ------------------------------------------------------
-class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
+class CalendarMergeSensor(StateWriteFilter, SensorEntity, BaseCalendarMergeSensor):
     """Sensor class for calendar merge."""
 
     _unrecorded_attributes = frozenset({MATCH_ALL})
@@ -132,14 +142,28 @@ class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
         self.events_sensors: list[CalendarMergeEventsSensor] = events_sensors
 
         self.translation_key = TRANSLATION_KEY
-        self.markdown_text: str = ""
-        self.events_dict: dict = {}
 
         self.coordinator: DataUpdateCoordinator = entry.runtime_data.coordinator
         self.calendar_handler: CalendarHandler = entry.runtime_data.calendar_handler
 
+        self.markdown_text: str = self.calendar_handler.markdown_text
+        self.events_attributes: dict[str, Any] = (
+            self.calendar_handler.get_events_attributes()
+        )
+
         self.coordinator.update_method = self.async_refresh
-        self.coordinator.update_interval = timedelta(minutes=5)
+
+        # The periodic refresh is done by the domain refresh scheduler
+        self.scheduler: RefreshScheduler = hass.data[DOMAIN].scheduler
+        self.refresh_interval: timedelta = (
+            REFRESH_INTERVAL_ON_CALENDAR_CHANGE
+            if self.calendar_handler.refresh_on_calendar_change
+            else REFRESH_INTERVAL
+        )
+
+        self.unsub_track_calendars: list[Callable[[], None]] = []
+        self.boundary_trigger: PointInUTCTimeTrigger | None = None
+        self.refresh_lock: asyncio.Lock = asyncio.Lock()
 
         # self.platform: EntityPlatform = entity_platform.async_get_current_platform()
 
@@ -182,29 +206,174 @@ class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
     # ------------------------------------------------------------------
     async def async_refresh(self) -> None:
         """Refresh."""
-        await self.calendar_handler.async_merge_calendar_events()
+        await self.calendar_handler.async_update_calendars()
+        await self.async_refresh_sensors()
+
+    # ------------------------------------------------------------------
+    async def async_refresh_sensors(self) -> None:
+        """Refresh sensors from the cached calendar events.
+
+        The scheduled, boundary and calendar change refreshes are serialized,
+        so the events composed are the events formatted, written to the sensors
+        and saved, also when another refresh runs meanwhile.
+        """
+
+        async with self.refresh_lock:
+            self.calendar_handler.compose_events()
+            await self.calendar_handler.async_format_events(
+                self.calendar_handler.events
+            )
+            self.refresh_events_sensors()
+
+            self.markdown_text = self.calendar_handler.create_markdown()
+            self.events_attributes = self.calendar_handler.get_events_attributes()
+
+            await self.calendar_handler.async_save_snapshot()
+
+            self.schedule_boundary_refresh()
 
-        for event_sensor in self.events_sensors:
-            await event_sensor.async_refresh()
+    # ------------------------------------------------------------------
+    @callback
+    def refresh_events_sensors(self) -> None:
+        """Refresh all event sensors in one pass from the formatted events."""
+
+        for event_sensor, formatted_event in zip(
+            self.events_sensors,
+            self.calendar_handler.get_formatted_events(len(self.events_sensors)),
+            strict=True,
+        ):
+            event_sensor.set_formatted_event(formatted_event)
+
+    # ------------------------------------------------------------------
+    def schedule_boundary_refresh(self) -> None:
+        """Schedule a refresh at the next point in time the events can change."""
+
+        if self.boundary_trigger is None:
+            return
 
-        self.markdown_text = self.calendar_handler.create_markdown()
-        self.events_dict = self.calendar_handler.get_events_to_att()
+        next_boundary: datetime | None = self.calendar_handler.get_next_boundary()
+
+        if next_boundary is None:
+            self.boundary_trigger.async_remove_from_hass()
+            return
+
+        self.boundary_trigger.start(
+            point_in_time_UTC=max(
+                dt_util.as_utc(next_boundary), dt_util.utcnow() + timedelta(seconds=1)
+            )
+        )
+
+    # ------------------------------------------------------------------
+    async def async_boundary_refresh(self) -> None:
+        """Refresh at an event boundary, the cached events are used."""
+
+        await self.async_refresh_sensors()
+        self.coordinator.async_update_listeners()
 
     # ------------------------------------------------------
     async def async_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass."""
+        self.untrack_calendars()
 
     # ------------------------------------------------------
     async def async_update(self) -> None:
         """Update the entity. Only used by the generic entity update service."""
         await self.coordinator.async_request_refresh()
 
+    # ------------------------------------------------------
+    def track_calendars(self) -> None:
+        """Track state and entity registry changes of the calendars."""
+
+        self.untrack_calendars()
+
+        self.unsub_track_calendars = [
+            async_track_state_change_event(
+                self.hass,
+                self.calendar_handler.calendar_entities,
+                self.async_calendar_state_changed,
+            ),
+            async_track_entity_registry_updated_event(
+                self.hass,
+                self.calendar_handler.calendar_entities,
+                self.async_calendar_registry_updated,
+            ),
+        ]
+
+    # ------------------------------------------------------
+    @callback
+    def untrack_calendars(self) -> None:
+        """Stop tracking the calendars."""
+
+        for unsub in self.unsub_track_calendars:
+            unsub()
+
+        self.unsub_track_calendars = []
+
+    # ------------------------------------------------------
+    async def async_calendar_state_changed(
+        self, event: Event[EventStateChangedData]
+    ) -> None:
+        """Calendar state changed, fetch only the changed calendar."""
+
+        if event.data["new_state"] is None:
+            return
+
+        await self.async_refresh_calendars(
+            [event.data["entity_id"]], event.time_fired
+        )
+
+    # ------------------------------------------------------
+    async def async_calendar_registry_updated(
+        self, event: Event[EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Calendar entity registry updated."""
+
+        if event.data["action"] == "remove":
+            self.calendar_handler.remove_calendar_entity(event.data["entity_id"])
+            self.track_calendars()
+            await self.async_refresh_calendars([])
+
+        elif event.data["action"] == "update" and "old_entity_id" in event.data:
+            self.calendar_handler.rename_calendar_entity(
+                event.data["old_entity_id"], event.data["entity_id"]
+            )
+            self.track_calendars()
+            await self.async_refresh_calendars(
+                [event.data["entity_id"]], event.time_fired
+            )
+
+    # ------------------------------------------------------
+    async def async_refresh_calendars(
+        self, calendar_entities: list[str], not_before: datetime | None = None
+    ) -> None:
+        """Refresh only the given calendars and update the listeners."""
+
+        await self.calendar_handler.async_update_calendars(
+            calendar_entities, not_before
+        )
+        await self.async_refresh_sensors()
+        self.coordinator.async_set_updated_data(None)
+
     # ------------------------------------------------------
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
 
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self.async_write_ha_state_if_changed)
+        )
+
+        self.boundary_trigger = PointInUTCTimeTrigger(
+            self, callback_trigger=self.async_boundary_refresh
+        )
+
+        self.async_on_remove(
+            self.scheduler.register(
+                self.entry.entry_id,
+                self.refresh_interval,
+                self.coordinator.async_refresh,
+                self.calendar_handler.get_next_boundary,
+                self.calendar_handler.calendar_entities,
+            )
         )
 
         self.async_on_remove(start.async_at_started(self.hass, self.async_hass_started))
@@ -214,9 +383,10 @@ class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
         """Hass started."""
 
         await self.calendar_handler.async_verify_calendar_entities_exist()
-        await self.calendar_handler.async_merge_calendar_events()
-        self.async_schedule_update_ha_state()
-        await self.coordinator.async_refresh()
+        self.scheduler.request_refresh(self.entry.entry_id)
+
+        if self.calendar_handler.refresh_on_calendar_change:
+            self.track_calendars()
 
     # ------------------------------------------------------
     @property
@@ -263,11 +433,24 @@ class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
 
         """
 
-        attr: dict = {}
-        attr["events"] = self.events_dict
+        attr: dict = {**self.events_attributes}
         attr["markdown_text"] = self.markdown_text
         return attr
 
+    # ------------------------------------------------------
+    def get_state_digest(self) -> int | None:
+        """Get the digest of the state, using the cached events attributes JSON."""
+
+        return hash(
+            (
+                self.state,
+                self.calendar_handler.events_attributes_json,
+                self.markdown_text,
+                self.name,
+                self.available,
+            )
+        )
+
     # ------------------------------------------------------------------
     @cached_property
     def supported_features(self) -> int | None:
@@ -330,7 +513,9 @@ class CalendarMergeSensor(SensorEntity, BaseCalendarMergeSensor):
 
 # ------------------------------------------------------
 # ------------------------------------------------------
-class CalendarMergeEventsSensor(SensorEntity, BaseCalendarMergeSensor):
+class CalendarMergeEventsSensor(
+    StateWriteFilter, SensorEntity, BaseCalendarMergeSensor
+):
     """Sensor class for calendar merge events."""
 
     _unrecorded_attributes = frozenset({MATCH_ALL})
@@ -357,17 +542,19 @@ class CalendarMergeEventsSensor(SensorEntity, BaseCalendarMergeSensor):
 
         self.translation_key = TRANSLATION_KEY
 
-        self.formated_event: str = ""
+        self.formated_event: str | None = (
+            self.calendar_handler.events[event_num].formatted_event
+            if event_num < len(self.calendar_handler.events)
+            else None
+        )
 
     # ------------------------------------------------------------------
-    async def async_refresh(self) -> None:
-        """Refresh."""
-        self.formated_event = await self.calendar_handler.async_format_event(
-            self.event_num
-        )
+    @callback
+    def set_formatted_event(self, formated_event: str | None) -> None:
+        """Set the formatted event, the state is written if changed."""
 
-        if self.entity_id is not None:
-            self.async_write_ha_state()
+        self.formated_event = formated_event
+        self.async_write_ha_state_if_changed()
 
     # ------------------------------------------------------
     async def async_will_remove_from_hass(self) -> None:
@@ -0,0 +1,71 @@
+"""Skip state writes of entities when nothing has changed."""
+
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.json import json_bytes
+
+from .const import LOGGER
+
+
+# ------------------------------------------------------
+# ------------------------------------------------------
+class StateWriteFilter(Entity):
+    """Entity mixin, skipping state writes when state and attributes are unchanged.
+
+    A digest of the state, attributes, name and availability is kept from the
+    last write. Refreshes use async_write_ha_state_if_changed, other state
+    writes are not affected.
+    """
+
+    state_digest: int | None = None
+    suppressed_writes: int = 0
+
+    # ------------------------------------------------------
+    def get_state_digest(self) -> int | None:
+        """Get the digest of the state, None if it can not be made."""
+
+        try:
+            return hash(
+                json_bytes(
+                    (
+                        self.state,
+                        self.state_attributes,
+                        self.extra_state_attributes,
+                        self.name,
+                        self.available,
+                    )
+                )
+            )
+        except (TypeError, ValueError, HomeAssistantError):
+            return None
+
+    # ------------------------------------------------------
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state, unless it is unchanged since the last write."""
+
+        if self.entity_id is None:
+            return
+
+        state_digest: int | None = self.get_state_digest()
+
+        if (
+            state_digest is not None
+            and state_digest == self.state_digest
+            and self.hass.states.get(self.entity_id) is not None
+        ):
+            self.suppressed_writes += 1
+
+            if self.suppressed_writes % 100 == 0:
+                LOGGER.debug(
+                    "%s: %s unchanged state writes skipped",
+                    self.entity_id,
+                    self.suppressed_writes,
+                )
+            return
+
+        self.state_digest = state_digest
+        self.async_write_ha_state()